@@ -0,0 +1,247 @@
+"""Admission control and load shedding.
+
+Requests are sorted into route classes, each with its own concurrency limit and
+a small bounded wait queue. When a class is saturated and its queue is full (or
+a queued request waits too long) the request is rejected immediately with 503
+instead of piling up behind the threadpool and DB pool. A per-client token
+bucket rejects bursts from a single client with 429. Both carry Retry-After.
+
+Health checks and dashboard stats each have their own class, so their capacity
+is reserved and stays available during an attendance write spike. The limits
+must fit in the DB pool (``DB_POOL_SIZE``) so admitted requests never wait on
+it; a warning is printed at startup if they don't. Only ``/api/*`` is
+controlled; static photos under ``/uploads`` don't touch the database.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+
+from dotenv import load_dotenv
+
+from database import DB_POOL_SIZE
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Seconds a request may wait for a slot. Keep well under the frontend's 10s axios timeout.
+QUEUE_TIMEOUT = _env_float("ADMISSION_QUEUE_TIMEOUT", 2.0)
+OVERLOAD_RETRY_AFTER = _env_int("ADMISSION_RETRY_AFTER", 2)
+
+# Per-client token bucket: sustained requests per second and burst size
+RATE_LIMIT_PER_SECOND = _env_float("RATE_LIMIT_PER_SECOND", 10.0)
+RATE_LIMIT_BURST = _env_int("RATE_LIMIT_BURST", 30)
+RATE_LIMIT_MAX_CLIENTS = 10000
+
+# Number of reverse proxies in front of the app that append to X-Forwarded-For
+# (1 on render.com). 0 trusts no header and keys clients by the socket peer.
+TRUSTED_PROXY_HOPS = _env_int("TRUSTED_PROXY_HOPS", 0)
+
+# (concurrency, max queued) per route class
+ROUTE_CLASS_LIMITS = {
+    "health": (_env_int("ADMISSION_HEALTH_CONCURRENCY", 2), _env_int("ADMISSION_HEALTH_QUEUE", 16)),
+    "dashboard": (_env_int("ADMISSION_DASHBOARD_CONCURRENCY", 2), _env_int("ADMISSION_DASHBOARD_QUEUE", 16)),
+    "attendance_write": (_env_int("ADMISSION_ATTENDANCE_CONCURRENCY", 6), _env_int("ADMISSION_ATTENDANCE_QUEUE", 32)),
+    "write": (_env_int("ADMISSION_WRITE_CONCURRENCY", 2), _env_int("ADMISSION_WRITE_QUEUE", 16)),
+    "read": (_env_int("ADMISSION_READ_CONCURRENCY", 4), _env_int("ADMISSION_READ_QUEUE", 32)),
+}
+
+# DB sessions one admitted request of each class may hold at once (default 1).
+# /api/health doesn't query the database; /api/dashboard/bootstrap (a read)
+# runs three queries concurrently, each on its own session.
+SESSIONS_PER_REQUEST = {"health": 0, "read": 3}
+
+
+def required_db_sessions(route_limits: dict = None) -> int:
+    """Connections needed so every admitted request gets a DB session without waiting"""
+    return sum(
+        limit * SESSIONS_PER_REQUEST.get(name, 1)
+        for name, (limit, _) in (route_limits or ROUTE_CLASS_LIMITS).items()
+    )
+
+
+if ADMISSION_CONTROL_ENABLED and DB_POOL_SIZE is not None and required_db_sessions() > DB_POOL_SIZE:
+    print(
+        f"WARNING: admission limits admit up to {required_db_sessions()} DB sessions but "
+        f"DB_POOL_SIZE is {DB_POOL_SIZE}; raise DB_POOL_SIZE or lower ADMISSION_*_CONCURRENCY"
+    )
+
+# Only API routes are admission controlled
+CONTROLLED_PATH_PREFIX = "/api/"
+
+# Never rate limited (platform health checks poll these)
+RATE_LIMIT_EXEMPT_PATHS = {"/api/health"}
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def classify_route(method: str, path: str) -> str:
+    """Map a request to its route class"""
+    if path == "/api/health":
+        return "health"
+    if path.rstrip("/") == "/api/dashboard/stats":
+        return "dashboard"
+    if method in WRITE_METHODS and not path.endswith("/batch-get"):
+        if path.rstrip("/") == "/api/attendance":
+            return "attendance_write"
+        return "write"
+    return "read"
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded, time-limited wait queue"""
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self._waiting = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot; False if the queue is full or the wait timed out"""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return True
+        if self._waiting >= self.max_queue:
+            return False
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+
+    def release(self):
+        self._semaphore.release()
+
+
+class TokenBucketRateLimiter:
+    """Per-client token buckets kept in memory (one worker process)"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = {}  # client -> (tokens, last refill time)
+
+    def take(self, client: str, now: float = None) -> float:
+        """Consume a token. Returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            self._buckets[client] = (tokens - 1, now)
+            if len(self._buckets) > self.max_clients:
+                self._prune(now)
+            return 0.0
+
+        self._buckets[client] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+    def _prune(self, now: float):
+        # Buckets idle long enough to have refilled completely carry no state
+        refill_time = self.burst / self.rate
+        self._buckets = {
+            client: (tokens, updated)
+            for client, (tokens, updated) in self._buckets.items()
+            if now - updated < refill_time
+        }
+
+
+def _client_key(scope, trusted_hops: int = TRUSTED_PROXY_HOPS) -> str:
+    """Client address for rate limiting.
+
+    Entries left of those appended by our own proxies are client-controlled, so
+    take the one the outermost trusted proxy appended (``trusted_hops`` from the
+    right) and never anything further left.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if trusted_hops <= 0:
+        return peer
+
+    forwarded = []
+    for name, value in scope.get("headers", []):
+        if name == b"x-forwarded-for":
+            forwarded.extend(v.strip() for v in value.decode("latin-1").split(",") if v.strip())
+    if len(forwarded) < trusted_hops:
+        return peer
+    return forwarded[-trusted_hops]
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: int):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying per-route-class concurrency limits and per-client rate limits"""
+
+    def __init__(
+        self,
+        app,
+        route_limits: dict = None,
+        queue_timeout: float = QUEUE_TIMEOUT,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: int = RATE_LIMIT_BURST,
+        retry_after: int = OVERLOAD_RETRY_AFTER,
+        trusted_hops: int = TRUSTED_PROXY_HOPS,
+    ):
+        self.app = app
+        self.retry_after = retry_after
+        self.trusted_hops = trusted_hops
+        self.limiters = {
+            name: ConcurrencyLimiter(limit, max_queue, queue_timeout)
+            for name, (limit, max_queue) in (route_limits or ROUTE_CLASS_LIMITS).items()
+        }
+        self.rate_limiter = TokenBucketRateLimiter(rate, burst)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(CONTROLLED_PATH_PREFIX)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path not in RATE_LIMIT_EXEMPT_PATHS:
+            wait = self.rate_limiter.take(_client_key(scope, self.trusted_hops))
+            if wait:
+                await _reject(send, 429, "Too many requests. Please slow down.", max(1, math.ceil(wait)))
+                return
+
+        limiter = self.limiters[classify_route(scope["method"], path)]
+        if not await limiter.acquire():
+            await _reject(send, 503, "Server is busy. Please retry shortly.", self.retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,385 @@
+"""Attendance partitioning and cold-store archival.
+
+Hot attendance rows for open periods live in the ``attendance`` table (monthly
+range partitions on PostgreSQL). Once a year is closed its rows are moved into
+``attendance_archive``: one zlib-compressed JSON payload per employee per year,
+kept in an attached database file on SQLite. Archived records stay readable
+through the regular attendance endpoints via ``crud``.
+
+Run the archival job with::
+
+    python archive.py                    # archive every closed year
+    python archive.py --through-year 2024
+"""
+import argparse
+import asyncio
+import json
+import os
+import zlib
+from datetime import date, datetime, timezone
+from itertools import groupby
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+
+from models import Attendance, AttendanceArchive, AttendanceStatus
+
+# Number of calendar years (including the current one) kept in the hot table
+HOT_YEARS = max(1, int(os.getenv("ATTENDANCE_HOT_YEARS", "1")))
+# Monthly partitions are pre-created this many months ahead on PostgreSQL
+PARTITION_MONTHS_AHEAD = 3
+# How often the running app re-checks upcoming partitions (seconds)
+PARTITION_MAINTENANCE_INTERVAL = 24 * 60 * 60
+# Retries when a concurrent first write to an archived year wins the insert
+ARCHIVE_WRITE_RETRIES = 3
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Cold-store payload helpers
+def pack_records(records: list) -> bytes:
+    """Compress archive entries ``[id, date, status, created_at, updated_at]``."""
+    records = sorted(records, key=lambda r: r[1])
+    return zlib.compress(json.dumps(records, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def unpack_records(payload: bytes) -> list:
+    """Decompress archive entries written by ``pack_records``."""
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _to_entry(record: Attendance) -> list:
+    return [
+        record.id,
+        record.date.isoformat(),
+        AttendanceStatus(record.status).value,
+        record.created_at.isoformat() if record.created_at else None,
+        record.updated_at.isoformat() if record.updated_at else None,
+    ]
+
+
+def _to_attendance(employee_id: str, entry: list) -> Attendance:
+    """Build a detached Attendance object from an archive entry (never added to a session)."""
+    record_id, record_date, record_status, created_at, updated_at = entry
+    return Attendance(
+        id=record_id,
+        employee_id=employee_id,
+        date=date.fromisoformat(record_date),
+        status=AttendanceStatus(record_status),
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else None,
+    )
+
+
+# Query routing
+def latest_closed_year() -> int:
+    """Latest year that may be archived; later years always stay in the hot table"""
+    return date.today().year - HOT_YEARS
+
+
+def lock_year(db: Session, year: int):
+    """Serialize writes to a closed year with the archival job (held until commit/rollback).
+
+    PostgreSQL takes a transaction-level advisory lock per year. SQLite only has a
+    database-wide write lock, so open the write transaction with a no-op DELETE.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('attendance_archive'), :year)"), {"year": year})
+    else:
+        db.execute(text("DELETE FROM attendance WHERE 0"))
+
+
+def archived_through(db: Session):
+    """Latest year held in the cold store, or None if nothing is archived.
+
+    Every year up to and including this one lives only in the cold store.
+    """
+    return db.query(AttendanceArchive.year).order_by(AttendanceArchive.year.desc()).limit(1).scalar()
+
+
+def iter_archived_attendance(
+    db: Session,
+    employee_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+):
+    """Yield archived attendance records newest first, decompressing one year at a time"""
+    years_query = db.query(AttendanceArchive.year).distinct()
+    if employee_id:
+        years_query = years_query.filter(AttendanceArchive.employee_id == employee_id)
+    if start_date:
+        years_query = years_query.filter(AttendanceArchive.year >= start_date.year)
+    if end_date:
+        years_query = years_query.filter(AttendanceArchive.year <= end_date.year)
+    years = [year for (year,) in years_query.order_by(AttendanceArchive.year.desc()).all()]
+
+    start_iso = start_date.isoformat() if start_date else None
+    end_iso = end_date.isoformat() if end_date else None
+    for year in years:
+        rows_query = db.query(AttendanceArchive).filter(AttendanceArchive.year == year)
+        if employee_id:
+            rows_query = rows_query.filter(AttendanceArchive.employee_id == employee_id)
+
+        records = []
+        for row in rows_query.all():
+            for entry in unpack_records(row.payload):
+                if start_iso and entry[1] < start_iso:
+                    continue
+                if end_iso and entry[1] > end_iso:
+                    continue
+                records.append(_to_attendance(row.employee_id, entry))
+        records.sort(key=lambda r: r.date, reverse=True)
+        yield from records
+
+
+def _allocate_attendance_id(db: Session) -> int:
+    """Take the next id from the hot table's sequence so archived ids stay unique.
+
+    Callers hold ``lock_year``, which on SQLite is the database write lock, so the
+    read-and-bump of ``sqlite_sequence`` cannot race another writer.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(text("SELECT nextval(pg_get_serial_sequence('attendance', 'id'))")).scalar()
+
+    # AUTOINCREMENT never hands out an id below sqlite_sequence, nor below the
+    # current maximum, so bumping past both reserves the id for the archive
+    seq = db.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'attendance'")).scalar()
+    max_id = db.execute(text("SELECT MAX(id) FROM attendance")).scalar()
+    record_id = max(seq or 0, max_id or 0) + 1
+    if seq is None:
+        db.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('attendance', :seq)"), {"seq": record_id})
+    else:
+        db.execute(text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'attendance'"), {"seq": record_id})
+    return record_id
+
+
+def upsert_archived_attendance(db: Session, attendance):
+    """Mark or update attendance for a date that falls in an archived year"""
+    for attempt in range(ARCHIVE_WRITE_RETRIES):
+        try:
+            return _upsert_archived_attendance(db, attendance)
+        except IntegrityError:
+            # A concurrent first write for this employee/year inserted the row; reload it
+            db.rollback()
+            if attempt == ARCHIVE_WRITE_RETRIES - 1:
+                raise
+
+
+def _upsert_archived_attendance(db: Session, attendance):
+    year = attendance.date.year
+    lock_year(db, year)
+    row = db.query(AttendanceArchive).filter(
+        AttendanceArchive.employee_id == attendance.employee_id,
+        AttendanceArchive.year == year,
+    ).with_for_update().first()
+    entries = unpack_records(row.payload) if row else []
+
+    now = _utcnow().isoformat()
+    status_value = AttendanceStatus(attendance.status).value
+    date_iso = attendance.date.isoformat()
+    entry = next((e for e in entries if e[1] == date_iso), None)
+    is_update = entry is not None
+    if entry:
+        entry[2] = status_value
+        entry[4] = now
+    else:
+        record_id = _allocate_attendance_id(db)
+        entry = [record_id, date_iso, status_value, now, now]
+        entries.append(entry)
+
+    if row is None:
+        row = AttendanceArchive(employee_id=attendance.employee_id, year=year)
+        db.add(row)
+    row.payload = pack_records(entries)
+    row.record_count = len(entries)
+    db.commit()
+    return _to_attendance(attendance.employee_id, entry), is_update
+
+
+def delete_archived_attendance(db: Session, employee_id: str):
+    """Delete all archived attendance for an employee (caller commits)"""
+    return db.query(AttendanceArchive).filter(AttendanceArchive.employee_id == employee_id).delete()
+
+
+# PostgreSQL partition management
+def _partition_name(year: int, month: int) -> str:
+    return f"attendance_y{year}m{month:02d}"
+
+
+def _is_partitioned(conn) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass('attendance')")
+    ).scalar()
+    return relkind == "p"
+
+
+def _partition_exists(conn, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar()
+
+
+def _create_month_partition(conn, name: str, start: date, end: date):
+    """Create one monthly partition, moving matching rows out of the DEFAULT partition.
+
+    PostgreSQL refuses to add a partition whose range already has rows in the
+    DEFAULT partition, so detach it, create the partition, move the rows across
+    and re-attach it, all in one transaction (writers block on the parent lock).
+    """
+    bounds = {"start": start, "end": end}
+    stranded = conn.execute(
+        text("SELECT 1 FROM attendance_default WHERE date >= :start AND date < :end LIMIT 1"),
+        bounds,
+    ).first()
+    partition_ddl = (
+        f"CREATE TABLE {name} PARTITION OF attendance "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+    if not stranded:
+        conn.execute(text(partition_ddl))
+        return
+
+    conn.execute(text("ALTER TABLE attendance DETACH PARTITION attendance_default"))
+    conn.execute(text(partition_ddl))
+    conn.execute(text(
+        "INSERT INTO attendance SELECT * FROM attendance_default WHERE date >= :start AND date < :end"
+    ), bounds)
+    conn.execute(text("DELETE FROM attendance_default WHERE date >= :start AND date < :end"), bounds)
+    conn.execute(text("ALTER TABLE attendance ATTACH PARTITION attendance_default DEFAULT"))
+
+
+def ensure_attendance_partitions(bind, months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """Create monthly partitions for the open years plus a DEFAULT partition.
+
+    Rows that landed in the DEFAULT partition before their month's partition
+    existed are moved into it. No-op unless ``attendance`` is a partitioned
+    PostgreSQL table (SQLite, or a table created before partitioning was
+    introduced). Returns created names.
+    """
+    created = []
+    with bind.connect() as conn:
+        if not _is_partitioned(conn):
+            return created
+
+        conn.execute(text("CREATE TABLE IF NOT EXISTS attendance_default PARTITION OF attendance DEFAULT"))
+        conn.commit()
+
+        today = date.today()
+        year, month = today.year - HOT_YEARS + 1, 1
+        last = (today.year * 12 + today.month - 1) + months_ahead
+        while year * 12 + month - 1 <= last:
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            name = _partition_name(year, month)
+            if not _partition_exists(conn, name):
+                try:
+                    _create_month_partition(conn, name, date(year, month, 1), date(next_year, next_month, 1))
+                    conn.commit()
+                    created.append(name)
+                except DBAPIError as e:
+                    conn.rollback()
+                    print(f"ERROR: could not create partition {name}: {e}")
+            year, month = next_year, next_month
+    return created
+
+
+async def maintain_attendance_partitions(bind, interval: float = PARTITION_MAINTENANCE_INTERVAL):
+    """Background task keeping upcoming monthly partitions ahead of the calendar"""
+    from fastapi.concurrency import run_in_threadpool
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(ensure_attendance_partitions, bind)
+        except Exception as e:
+            print(f"ERROR in partition maintenance: {e}")
+
+
+# Archival job
+def archive_closed_years(db: Session, through_year: int = None):
+    """Move hot attendance rows for closed years into the cold store.
+
+    Each year is archived in a single transaction, holding the year lock so
+    concurrent writes to that year wait for it. Returns ``{year: rows_moved}``.
+    Raises ValueError if ``through_year`` is not yet closed.
+    """
+    if through_year is None:
+        through_year = latest_closed_year()
+    if through_year > latest_closed_year():
+        raise ValueError(
+            f"Cannot archive {through_year}: only years up to {latest_closed_year()} are closed "
+            f"(ATTENDANCE_HOT_YEARS={HOT_YEARS})"
+        )
+
+    oldest = db.query(Attendance.date).order_by(Attendance.date.asc()).limit(1).scalar()
+    if oldest is None:
+        return {}
+
+    partitioned = _is_partitioned(db.connection())
+    moved = {}
+    for year in range(oldest.year, through_year + 1):
+        year_start, year_end = date(year, 1, 1), date(year, 12, 31)
+        lock_year(db, year)
+        rows = (
+            db.query(Attendance)
+            .filter(Attendance.date >= year_start, Attendance.date <= year_end)
+            .order_by(Attendance.employee_id, Attendance.date)
+            .all()
+        )
+        if not rows:
+            db.rollback()
+            continue
+
+        for employee_id, records in groupby(rows, key=lambda r: r.employee_id):
+            archive_row = db.query(AttendanceArchive).filter(
+                AttendanceArchive.employee_id == employee_id,
+                AttendanceArchive.year == year,
+            ).first()
+            entries = {e[1]: e for e in unpack_records(archive_row.payload)} if archive_row else {}
+            for record in records:
+                entries[record.date.isoformat()] = _to_entry(record)
+
+            if archive_row is None:
+                archive_row = AttendanceArchive(employee_id=employee_id, year=year)
+                db.add(archive_row)
+            archive_row.payload = pack_records(list(entries.values()))
+            archive_row.record_count = len(entries)
+
+        db.flush()
+        if partitioned:
+            # Dropping whole monthly partitions avoids a large DELETE and leaves no dead tuples
+            for month in range(1, 13):
+                db.execute(text(f"DROP TABLE IF EXISTS {_partition_name(year, month)}"))
+        db.query(Attendance).filter(
+            Attendance.date >= year_start, Attendance.date <= year_end
+        ).delete(synchronize_session=False)
+        db.commit()
+        moved[year] = len(rows)
+    return moved
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, engine, Base
+
+    parser = argparse.ArgumentParser(description="Archive closed attendance years into the cold store")
+    parser.add_argument(
+        "--through-year",
+        type=int,
+        default=None,
+        help=f"Last year to archive (default and maximum: current year - {HOT_YEARS})",
+    )
+    args = parser.parse_args()
+    if args.through_year is not None and args.through_year > latest_closed_year():
+        parser.error(f"--through-year must be at most {latest_closed_year()}; later years are still open")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        for archived_year, count in archive_closed_years(db, args.through_year).items():
+            print(f"Archived {count} attendance records for {archived_year}")
+    finally:
+        db.close()
+    # Also keeps upcoming monthly partitions in place when run from cron
+    ensure_attendance_partitions(engine)
@@ -0,0 +1,129 @@
+"""Compare page-load requests before and after the composite endpoints.
+
+Replays what each page requested on mount before the composite endpoints
+(the baseline frontend) and what it requests now, issuing parallel requests
+the way the browser does (up to 6 per host):
+
+  * Attendance page: GET /api/attendance + GET /api/employees (2 requests)
+    vs GET /api/dashboard/bootstrap?include_attendance=true (1 request, which
+    also carries today's statuses and the records' employee names)
+  * Employees page: GET /api/employees (1 request) vs
+    GET /api/dashboard/bootstrap (1 request). No round trip is saved; the
+    response is heavier because it adds today's status for the "Today" column.
+  * Name lookup (API clients, no page uses it): N x GET /api/employees/{id}
+    vs one POST /api/employees/batch-get
+
+Home and Dashboard make the same single GET /api/dashboard/stats call as
+before and are not compared. After marking attendance both versions of the
+Attendance page refetch GET /api/attendance only.
+
+Usage::
+
+    python bench_page_load.py --base-url https://hrms-site.onrender.com --runs 20
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Browsers open at most 6 HTTP/1.1 connections per host
+BROWSER_CONNECTIONS = 6
+
+
+def _request(base_url: str, path: str, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(
+        base_url + path,
+        data=data,
+        headers={"Content-Type": "application/json"},
+        method="POST" if data is not None else "GET",
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read() or b"null")
+
+
+def _time_ms(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def _report(label: str, before, now):
+    before_median, before_max = before
+    now_median, now_max = now
+    saved = before_median - now_median
+    pct = (saved / before_median * 100) if before_median else 0
+    print(f"{label}")
+    print(f"  before         : median {before_median:8.1f} ms   max {before_max:8.1f} ms")
+    print(f"  now            : median {now_median:8.1f} ms   max {now_max:8.1f} ms")
+    print(f"  saved          : {saved:8.1f} ms per load ({pct:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page-load requests before and after the composite endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--lookup-size", type=int, default=20, help="Employees fetched in the name lookup comparison")
+    args = parser.parse_args()
+    base_url = args.base_url.rstrip("/")
+    pool = ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS)
+
+    def get(path):
+        return _request(base_url, path)
+
+    def parallel(*paths):
+        return list(pool.map(get, paths))
+
+    # Warm up (render.com free instances cold-start)
+    get("/api/health")
+
+    def attendance_page_before():
+        parallel("/api/attendance", "/api/employees?skip=0&limit=100")
+
+    def attendance_page_now():
+        get("/api/dashboard/bootstrap?skip=0&limit=100&include_attendance=true")
+
+    _report(
+        "Attendance page mount (2 requests -> 1)",
+        _time_ms(attendance_page_before, args.runs),
+        _time_ms(attendance_page_now, args.runs),
+    )
+
+    def employees_page_before():
+        get("/api/employees?skip=0&limit=100")
+
+    def employees_page_now():
+        get("/api/dashboard/bootstrap?skip=0&limit=100")
+
+    _report(
+        "Employees page mount (1 request -> 1, now with today's status)",
+        _time_ms(employees_page_before, args.runs),
+        _time_ms(employees_page_now, args.runs),
+    )
+
+    employee_ids = [e["employee_id"] for e in get(f"/api/employees?limit={args.lookup_size}")]
+    if not employee_ids:
+        print("No employees found; skipping the batch-get comparison")
+        return
+
+    def legacy_lookup():
+        parallel(*[f"/api/employees/{urllib.parse.quote(employee_id)}" for employee_id in employee_ids])
+
+    def batch_lookup():
+        _request(base_url, "/api/employees/batch-get", {"employee_ids": employee_ids})
+
+    _report(
+        f"Name lookup of {len(employee_ids)} employees (API only)",
+        _time_ms(legacy_lookup, args.runs),
+        _time_ms(batch_lookup, args.runs),
+    )
+
+
+if __name__ == "__main__":
+    main()
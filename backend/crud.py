@@ -1,8 +1,11 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from models import Employee, Attendance, AttendanceStatus
 from schemas import EmployeeCreate, EmployeeUpdate, AttendanceCreate
 from datetime import date
+from itertools import islice
+import archive
 
 
 # Employee CRUD Operations
@@ -49,14 +52,27 @@ def list_employees(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Employee).offset(skip).limit(limit).all()
 
 
+def get_employees_by_ids(db: Session, employee_ids: list[str]):
+    """Get many employees by employee_id in a single query"""
+    if not employee_ids:
+        return []
+    return db.query(Employee).filter(Employee.employee_id.in_(employee_ids)).all()
+
+
+def count_employees(db: Session) -> int:
+    """Count all employees"""
+    return db.query(func.count(Employee.id)).scalar() or 0
+
+
 def delete_employee(db: Session, employee_id: str):
     """Delete an employee"""
     employee = get_employee(db, employee_id)
     if not employee:
         return None
     
-    # Also delete related attendance records
+    # Also delete related attendance records, hot and archived
     db.query(Attendance).filter(Attendance.employee_id == employee_id).delete()
+    archive.delete_archived_attendance(db, employee_id)
     
     db.delete(employee)
     db.commit()
@@ -66,6 +82,14 @@ def delete_employee(db: Session, employee_id: str):
 # Attendance CRUD Operations
 def mark_attendance(db: Session, attendance: AttendanceCreate):
     """Mark or update attendance for an employee on a specific date"""
+    # Open years are never archived, so the common write path skips the cold store
+    if attendance.date.year <= archive.latest_closed_year():
+        # Closed years may be archived concurrently; wait for the archival job
+        archive.lock_year(db, attendance.date.year)
+        archived_through = archive.archived_through(db)
+        if archived_through is not None and attendance.date.year <= archived_through:
+            return archive.upsert_archived_attendance(db, attendance)
+
     existing = db.query(Attendance).filter(
         Attendance.employee_id == attendance.employee_id,
         Attendance.date == attendance.date
@@ -89,10 +113,37 @@ def mark_attendance(db: Session, attendance: AttendanceCreate):
 
 
 def get_attendance(db: Session, attendance_id: int):
-    """Get a specific attendance record"""
+    """Get a specific attendance record from the hot table"""
     return db.query(Attendance).filter(Attendance.id == attendance_id).first()
 
 
+def get_attendance_for_date(db: Session, day: date):
+    """Get every attendance record for a single (hot) date"""
+    return db.query(Attendance).filter(Attendance.date == day).all()
+
+
+def _reads_archive(archived_through, start_date: date = None) -> bool:
+    """Whether a query starting at start_date reaches into archived years"""
+    if archived_through is None:
+        return False
+    return start_date is None or start_date.year <= archived_through
+
+
+def _paginate_hot_then_archived(hot_query, archived_records, skip: int, limit: int):
+    """Page through hot rows (newest first), continuing into archived records.
+
+    Hot rows are always newer than archived ones, so the archive is only
+    touched when a page runs past the end of the hot table.
+    """
+    hot = hot_query.order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
+    if len(hot) == limit or archived_records is None:
+        return hot
+
+    hot_total = skip + len(hot) if hot else hot_query.count()
+    archived_skip = max(0, skip - hot_total)
+    return hot + list(islice(archived_records, archived_skip, archived_skip + limit - len(hot)))
+
+
 def get_attendance_by_employee(
     db: Session,
     employee_id: str,
@@ -108,10 +159,22 @@ def get_attendance_by_employee(
         query = query.filter(Attendance.date >= start_date)
     if end_date:
         query = query.filter(Attendance.date <= end_date)
-    
-    return query.order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
+
+    archived_through = archive.archived_through(db)
+    archived_records = None
+    if _reads_archive(archived_through, start_date):
+        archived_records = archive.iter_archived_attendance(db, employee_id, start_date, end_date)
+        if end_date and end_date.year <= archived_through:
+            # Range lies entirely in closed years: skip the hot table
+            return list(islice(archived_records, skip, skip + limit))
+
+    return _paginate_hot_then_archived(query, archived_records, skip, limit)
 
 
 def list_attendance(db: Session, skip: int = 0, limit: int = 100):
     """List all attendance records"""
-    return db.query(Attendance).order_by(Attendance.date.desc()).offset(skip).limit(limit).all()
+    archived_records = None
+    if _reads_archive(archive.archived_through(db)):
+        archived_records = archive.iter_archived_attendance(db)
+
+    return _paginate_hot_then_archived(db.query(Attendance), archived_records, skip, limit)
@@ -1,6 +1,8 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,11 +16,46 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Connections kept in the pool. admission.py checks that its concurrency limits
+# fit in it; the small overflow covers background jobs (partition maintenance).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "24"))
+DB_MAX_OVERFLOW = 2
+
+# In-memory SQLite uses a single-connection pool that takes no sizing; DB_POOL_SIZE
+# is None there so nothing checks limits against it
+_url = make_url(DATABASE_URL)
+if not issubclass(_url.get_dialect().get_pool_class(_url), QueuePool):
+    DB_POOL_SIZE = None
+
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+    **({"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW} if DB_POOL_SIZE else {}),
 )
 
+IS_POSTGRES = engine.dialect.name == "postgresql"
+
+# Closed attendance years are moved into a compressed cold store (see archive.py).
+# On SQLite the cold store lives in a separate database file attached to every
+# connection as the "archive" schema, so the hot file only holds recent data.
+ARCHIVE_SCHEMA = None
+
+if engine.dialect.name == "sqlite":
+    ARCHIVE_SCHEMA = "archive"
+    _main_database = _url.database
+    if _main_database and _main_database != ":memory:":
+        _root, _ext = os.path.splitext(_main_database)
+        _default_archive = f"{_root}_archive{_ext or '.db'}"
+    else:
+        _default_archive = ":memory:"
+    ARCHIVE_DATABASE_PATH = os.getenv("ATTENDANCE_ARCHIVE_DB", _default_archive)
+
+    @event.listens_for(engine, "connect")
+    def _attach_archive(dbapi_connection, connection_record):
+        dbapi_connection.execute(
+            f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (ARCHIVE_DATABASE_PATH,)
+        )
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -29,3 +66,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def run_with_session(fn, *args, **kwargs):
+    """Call fn(db, *args, **kwargs) with a dedicated session.
+
+    Sessions are not thread-safe, so queries fanned out concurrently (e.g. via
+    run_in_threadpool) each get their own session and pooled connection.
+    """
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
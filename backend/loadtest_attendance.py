@@ -0,0 +1,170 @@
+"""Load test for the shift-start attendance write spike.
+
+Many simulated clients (each with its own X-Forwarded-For address) replay the
+Attendance page at once while a probe polls /api/health: each loads the page
+(GET /api/dashboard/bootstrap?include_attendance=true), then repeatedly submits
+attendance and, like the page, refetches GET /api/attendance after every
+accepted mark. Like the frontend, clients back off for Retry-After seconds when
+shed with 429/503. Reports latency
+percentiles per outcome so admission control can be compared on and off
+(start the API with ADMISSION_CONTROL_ENABLED=false for the baseline).
+
+Clients are told apart by X-Forwarded-For, so start the API with
+TRUSTED_PROXY_HOPS=1 to stand in for the render.com proxy that sets it.
+
+Usage::
+
+    TRUSTED_PROXY_HOPS=1 uvicorn main:app --port 8000
+    python loadtest_attendance.py --base-url http://localhost:8000 --clients 300 --duration 20
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+# Matches the frontend's axios timeout in services/api.js
+CLIENT_TIMEOUT = 10
+
+
+def _post(base_url: str, path: str, body: dict, client_ip: str):
+    """POST and return (outcome, latency ms, Retry-After seconds or None)"""
+    req = urllib.request.Request(
+        base_url + path,
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json", "X-Forwarded-For": client_ip},
+        method="POST",
+    )
+    retry_after = None
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=CLIENT_TIMEOUT) as resp:
+            resp.read()
+            outcome = str(resp.status)
+    except urllib.error.HTTPError as e:
+        outcome = str(e.code)
+        if e.headers.get("Retry-After"):
+            retry_after = float(e.headers["Retry-After"])
+    except Exception:
+        outcome = "timeout/error"
+    return outcome, (time.perf_counter() - start) * 1000, retry_after
+
+
+def _get(base_url: str, path: str, client_ip: str = None):
+    """GET and return (outcome, latency ms, Retry-After seconds or None)"""
+    req = urllib.request.Request(base_url + path, headers={"X-Forwarded-For": client_ip} if client_ip else {})
+    retry_after = None
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=CLIENT_TIMEOUT) as resp:
+            resp.read()
+            outcome = str(resp.status)
+    except urllib.error.HTTPError as e:
+        outcome = str(e.code)
+        if e.headers.get("Retry-After"):
+            retry_after = float(e.headers["Retry-After"])
+    except Exception:
+        outcome = "timeout/error"
+    return outcome, (time.perf_counter() - start) * 1000, retry_after
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+
+def _print_latencies(title: str, results):
+    by_outcome = defaultdict(list)
+    for outcome, ms in results:
+        by_outcome[outcome].append(ms)
+    all_ms = [ms for _, ms in results]
+    print(f"{title}: {len(results)} requests  p50 {_percentile(all_ms, 50):7.1f} ms  p99 {_percentile(all_ms, 99):7.1f} ms")
+    for outcome, samples in sorted(by_outcome.items()):
+        print(
+            f"  {outcome:>23}: {len(samples):6d}  "
+            f"p50 {_percentile(samples, 50):7.1f} ms  p99 {_percentile(samples, 99):7.1f} ms  max {max(samples):7.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attendance write-spike load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=300, help="Concurrent simulated clients")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to sustain the spike")
+    parser.add_argument("--employees", type=int, default=200, help="Load-test employees to create/use")
+    parser.add_argument("--think", type=float, default=1.0, help="Seconds a client pauses between submissions")
+    args = parser.parse_args()
+    base_url = args.base_url.rstrip("/")
+
+    employee_ids = [f"LOAD-{i:04d}" for i in range(args.employees)]
+    for i, employee_id in enumerate(employee_ids):
+        # 400 if the employee already exists from a previous run
+        _post(base_url, "/api/employees/json", {
+            "employee_id": employee_id,
+            "full_name": f"Load Test {i}",
+            "email": f"load{i}@loadtest.example.com",
+            "department": "Load Test",
+        }, f"10.255.{i // 250}.{i % 250 + 1}")
+
+    deadline = time.monotonic() + args.duration
+    write_results, read_results, health_results = [], [], []
+    lock = threading.Lock()
+
+    def client(n: int):
+        client_ip = f"10.0.{n // 250}.{n % 250 + 1}"
+        rng = random.Random(n)
+        writes, reads = [], []
+
+        def backoff(retry_after):
+            # Back off as instructed when shed, with jitter so retries don't re-synchronize
+            time.sleep(retry_after * rng.uniform(1, 1.5) if retry_after else rng.uniform(0, 2 * args.think))
+
+        # Page mount
+        outcome, ms, retry_after = _get(base_url, "/api/dashboard/bootstrap?include_attendance=true", client_ip)
+        reads.append(("bootstrap " + outcome, ms))
+        backoff(retry_after)
+
+        while time.monotonic() < deadline:
+            outcome, ms, retry_after = _post(base_url, "/api/attendance/", {
+                "employee_id": rng.choice(employee_ids),
+                "date": (date.today() - timedelta(days=rng.randrange(30))).isoformat(),
+                "status": rng.choice(["Present", "Absent"]),
+            }, client_ip)
+            writes.append((outcome, ms))
+            if outcome == "200":
+                outcome, ms, retry_after = _get(base_url, "/api/attendance", client_ip)
+                reads.append(("list " + outcome, ms))
+            backoff(retry_after)
+        with lock:
+            write_results.extend(writes)
+            read_results.extend(reads)
+
+    def health_probe():
+        while time.monotonic() < deadline:
+            outcome, ms, _ = _get(base_url, "/api/health")
+            health_results.append((outcome, ms))
+            time.sleep(0.1)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.clients + 1) as pool:
+        pool.submit(health_probe)
+        for n in range(args.clients):
+            pool.submit(client, n)
+    elapsed = time.monotonic() - started
+
+    accepted = Counter(outcome for outcome, _ in write_results)["200"]
+    print(f"{args.clients} clients for {elapsed:.1f}s, {accepted / elapsed:.1f} accepted writes/s")
+    _print_latencies("POST /api/attendance", write_results)
+    _print_latencies("Page reads (bootstrap mount, list refetch)", read_results)
+    _print_latencies("GET /api/health", health_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
 
-from database import engine, Base
+from database import engine, Base, IS_POSTGRES
 from routers import employees, attendance, dashboard
+from archive import ensure_attendance_partitions, maintain_attendance_partitions
+from admission import AdmissionControlMiddleware, ADMISSION_CONTROL_ENABLED
 
 load_dotenv()
 
@@ -13,15 +17,32 @@ load_dotenv()
 UPLOAD_DIR = "uploads/photos"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# Create tables
+# Create tables (and monthly attendance partitions on PostgreSQL)
 Base.metadata.create_all(bind=engine)
+ensure_attendance_partitions(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep creating upcoming monthly partitions while the process runs
+    maintenance = asyncio.create_task(maintain_attendance_partitions(engine)) if IS_POSTGRES else None
+    yield
+    if maintenance:
+        maintenance.cancel()
+
 
 app = FastAPI(
     title="HRMS Lite API",
     description="A lightweight Human Resource Management System API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Admission control / load shedding. Added before CORS so CORS wraps it and
+# 429/503 responses still carry CORS headers for the browser.
+if ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Configuration
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 ALLOWED_ORIGINS = [
@@ -46,6 +67,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 
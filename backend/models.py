@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Date, Enum, UniqueConstraint, DateTime
+from sqlalchemy import Column, Integer, String, Date, Enum, UniqueConstraint, DateTime, LargeBinary
 from sqlalchemy.sql import func
 import enum
-from database import Base
+from database import Base, IS_POSTGRES, ARCHIVE_SCHEMA
 
 
 class Employee(Base):
@@ -28,15 +28,43 @@ class AttendanceStatus(str, enum.Enum):
 
 
 class Attendance(Base):
+    """Hot attendance records for open periods.
+
+    On PostgreSQL the table is range-partitioned by month on ``date`` (the
+    partition key has to be part of the primary key there); partitions are
+    managed by ``archive.ensure_attendance_partitions``.
+    """
     __tablename__ = "attendance"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     employee_id = Column(String, nullable=False, index=True)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False, index=True, primary_key=IS_POSTGRES)
     status = Column(Enum(AttendanceStatus), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
         UniqueConstraint("employee_id", "date", name="uq_employee_date"),
+        {
+            "postgresql_partition_by": "RANGE (date)",
+            # Archived rows are deleted from this table, so ids must never be reused
+            "sqlite_autoincrement": True,
+        },
+    )
+
+
+class AttendanceArchive(Base):
+    """Cold store for closed years: one zlib-compressed payload per employee per year."""
+    __tablename__ = "attendance_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(String, nullable=False, index=True)
+    year = Column(Integer, nullable=False, index=True)
+    record_count = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary, nullable=False)
+    archived_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("employee_id", "year", name="uq_archive_employee_year"),
+        {"schema": ARCHIVE_SCHEMA},
     )
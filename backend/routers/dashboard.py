@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import date
-from database import get_db
+from database import get_db, run_with_session
 from models import Employee, Attendance, AttendanceStatus
+from schemas import DashboardBootstrap, Attendance as AttendanceSchema, Employee as EmployeeSchema, ErrorDetail
+import crud
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
@@ -49,3 +53,73 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch dashboard stats: {str(e)}",
         )
+
+
+@router.get(
+    "/bootstrap",
+    response_model=DashboardBootstrap,
+    responses={
+        500: {"model": ErrorDetail, "description": "Server error"},
+    },
+)
+async def get_dashboard_bootstrap(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    include_attendance: bool = Query(False),
+):
+    """Get dashboard stats, a page of employees and today's attendance map in one response.
+
+    With ``include_attendance`` the latest attendance records (as returned by
+    GET /api/attendance) and the names of their employees are included too, so
+    the Attendance page loads with a single request.
+
+    The queries run concurrently on at most three pooled sessions.
+    """
+    def _employee_page(db: Session):
+        # Serialize inside the worker so nothing lazy-loads after the session closes
+        return [
+            EmployeeSchema.model_validate(e)
+            for e in crud.list_employees(db, skip=skip, limit=limit)
+        ]
+
+    def _attendance(db: Session):
+        today_attendance = {
+            record.employee_id: record.status.value
+            for record in crud.get_attendance_for_date(db, date.today())
+        }
+        if not include_attendance:
+            return today_attendance, None, None
+
+        records = [AttendanceSchema.model_validate(r) for r in crud.list_attendance(db)]
+        employee_ids = list({r.employee_id for r in records})
+        employee_names = {
+            e.employee_id: e.full_name for e in crud.get_employees_by_ids(db, employee_ids)
+        }
+        return today_attendance, records, employee_names
+
+    try:
+        total_employees, employees, (today_attendance, records, employee_names) = await asyncio.gather(
+            run_in_threadpool(run_with_session, crud.count_employees),
+            run_in_threadpool(run_with_session, _employee_page),
+            run_in_threadpool(run_with_session, _attendance),
+        )
+        statuses = list(today_attendance.values())
+        return {
+            "stats": {
+                "total_employees": total_employees,
+                "present_today": statuses.count(AttendanceStatus.PRESENT.value),
+                "absent_today": statuses.count(AttendanceStatus.ABSENT.value),
+            },
+            "employees": employees,
+            "today_attendance": today_attendance,
+            "attendance": records,
+            "employee_names": employee_names,
+        }
+    except Exception as e:
+        print(f"ERROR in get_dashboard_bootstrap: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch dashboard bootstrap: {str(e)}",
+        )
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, Form
 from sqlalchemy.orm import Session
 from database import get_db
-from schemas import Employee, EmployeeCreate, ErrorDetail
+from schemas import Employee, EmployeeCreate, EmployeeBatchGet, EmployeeBatchGetResult, ErrorDetail
 import crud
 import os
 import shutil
@@ -107,6 +107,29 @@ def create_employee_json(employee: EmployeeCreate, db: Session = Depends(get_db)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create employee")
 
 
+@router.post(
+    "/batch-get",
+    response_model=EmployeeBatchGetResult,
+    responses={
+        500: {"model": ErrorDetail, "description": "Server error"},
+    },
+)
+def batch_get_employees(request: EmployeeBatchGet, db: Session = Depends(get_db)):
+    """Get many employees by employee_id in one request. Unknown ids are listed in not_found."""
+    try:
+        employee_ids = list(dict.fromkeys(request.employee_ids))
+        found = {e.employee_id: e for e in crud.get_employees_by_ids(db, employee_ids)}
+        return {
+            "employees": [found[eid] for eid in employee_ids if eid in found],
+            "not_found": [eid for eid in employee_ids if eid not in found],
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch employees",
+        )
+
+
 @router.get(
     "/",
     response_model=list[Employee],
@@ -90,5 +90,29 @@ class Attendance(AttendanceBase):
         from_attributes = True
 
 
+class EmployeeBatchGet(BaseModel):
+    employee_ids: list[str] = Field(..., min_length=1, max_length=1000)
+
+
+class EmployeeBatchGetResult(BaseModel):
+    employees: list[Employee]
+    not_found: list[str]
+
+
+class DashboardStats(BaseModel):
+    total_employees: int
+    present_today: int
+    absent_today: int
+
+
+class DashboardBootstrap(BaseModel):
+    stats: DashboardStats
+    employees: list[Employee]
+    today_attendance: dict[str, AttendanceStatusEnum]
+    # Only with include_attendance=true
+    attendance: Optional[list[Attendance]] = None
+    employee_names: Optional[dict[str, str]] = None
+
+
 class ErrorDetail(BaseModel):
     detail: str
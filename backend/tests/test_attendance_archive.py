@@ -0,0 +1,138 @@
+from datetime import date
+
+import pytest
+
+import archive
+import crud
+from models import Attendance, AttendanceArchive
+from schemas import AttendanceCreate, EmployeeCreate
+
+# Well inside the closed years regardless of when the suite runs
+ARCHIVED_YEAR = 2020
+HOT_YEAR = 2021
+
+
+def _employee(db, employee_id):
+    crud.create_employee(db, EmployeeCreate(
+        employee_id=employee_id,
+        full_name=f"Employee {employee_id}",
+        email=f"{employee_id.lower()}@example.com",
+        department="Engineering",
+    ))
+
+
+def _mark(db, employee_id, day, status="Present"):
+    return crud.mark_attendance(db, AttendanceCreate(employee_id=employee_id, date=day, status=status))
+
+
+def _dates(records):
+    return [r.date for r in records]
+
+
+@pytest.fixture
+def split_store(db):
+    """EMP001 with 3 hot days in HOT_YEAR and 4 archived days in ARCHIVED_YEAR"""
+    _employee(db, "EMP001")
+    for day in (1, 2, 3, 4):
+        _mark(db, "EMP001", date(ARCHIVED_YEAR, 3, day))
+    for day in (1, 2, 3):
+        _mark(db, "EMP001", date(HOT_YEAR, 5, day))
+
+    assert archive.archive_closed_years(db, through_year=ARCHIVED_YEAR) == {ARCHIVED_YEAR: 4}
+    return db
+
+
+HOT_DATES = [date(HOT_YEAR, 5, d) for d in (3, 2, 1)]
+ARCHIVED_DATES = [date(ARCHIVED_YEAR, 3, d) for d in (4, 3, 2, 1)]
+ALL_DATES = HOT_DATES + ARCHIVED_DATES
+
+
+def test_archival_moves_rows_out_of_hot_table(split_store):
+    db = split_store
+    assert db.query(Attendance).count() == 3
+    row = db.query(AttendanceArchive).one()
+    assert (row.employee_id, row.year, row.record_count) == ("EMP001", ARCHIVED_YEAR, 4)
+    assert archive.archived_through(db) == ARCHIVED_YEAR
+
+
+def test_archiving_open_year_is_rejected(db):
+    with pytest.raises(ValueError):
+        archive.archive_closed_years(db, through_year=archive.latest_closed_year() + 1)
+
+
+@pytest.mark.parametrize("skip,limit", [(0, 3), (0, 4), (2, 3), (1, 10), (0, 100)])
+def test_pages_cross_hot_archive_boundary(split_store, skip, limit):
+    expected = ALL_DATES[skip:skip + limit]
+    assert _dates(crud.list_attendance(split_store, skip=skip, limit=limit)) == expected
+    assert _dates(crud.get_attendance_by_employee(split_store, "EMP001", skip=skip, limit=limit)) == expected
+
+
+@pytest.mark.parametrize("skip", [3, 4, 6, 7, 20])
+def test_deep_skip_past_hot_rows(split_store, skip):
+    expected = ALL_DATES[skip:skip + 2]
+    assert _dates(crud.list_attendance(split_store, skip=skip, limit=2)) == expected
+    assert _dates(crud.get_attendance_by_employee(split_store, "EMP001", skip=skip, limit=2)) == expected
+
+
+def test_archive_only_range(split_store):
+    db = split_store
+    start, end = date(ARCHIVED_YEAR, 3, 2), date(ARCHIVED_YEAR, 3, 3)
+    records = crud.get_attendance_by_employee(db, "EMP001", start_date=start, end_date=end)
+    assert _dates(records) == [date(ARCHIVED_YEAR, 3, 3), date(ARCHIVED_YEAR, 3, 2)]
+
+    paged = crud.get_attendance_by_employee(
+        db, "EMP001", start_date=date(ARCHIVED_YEAR, 1, 1), end_date=date(ARCHIVED_YEAR, 12, 31), skip=1, limit=2
+    )
+    assert _dates(paged) == ARCHIVED_DATES[1:3]
+
+
+def test_range_spanning_both_stores(split_store):
+    records = crud.get_attendance_by_employee(
+        split_store, "EMP001", start_date=date(ARCHIVED_YEAR, 3, 3), end_date=date(HOT_YEAR, 5, 2)
+    )
+    assert _dates(records) == [date(HOT_YEAR, 5, 2), date(HOT_YEAR, 5, 1), date(ARCHIVED_YEAR, 3, 4), date(ARCHIVED_YEAR, 3, 3)]
+
+
+def test_hot_only_range_skips_archive(split_store):
+    records = crud.get_attendance_by_employee(split_store, "EMP001", start_date=date(HOT_YEAR, 1, 1))
+    assert _dates(records) == HOT_DATES
+
+
+def test_write_new_record_to_archived_year(split_store):
+    db = split_store
+    existing_ids = {r.id for r in crud.list_attendance(db)}
+
+    record, is_update = _mark(db, "EMP001", date(ARCHIVED_YEAR, 6, 1), "Absent")
+    assert not is_update
+    assert record.id not in existing_ids
+    assert record.status.value == "Absent"
+
+    # Stays in the cold store, never in the hot table
+    assert db.query(Attendance).filter(Attendance.date == date(ARCHIVED_YEAR, 6, 1)).count() == 0
+    assert db.query(AttendanceArchive).one().record_count == 5
+    assert _dates(crud.list_attendance(db))[3] == date(ARCHIVED_YEAR, 6, 1)
+
+    # The hot table's sequence moved past the archived id
+    hot_record, _ = _mark(db, "EMP001", date(HOT_YEAR, 5, 4))
+    assert hot_record.id > record.id
+
+
+def test_update_record_in_archived_year(split_store):
+    db = split_store
+    before = {r.date: r for r in crud.list_attendance(db)}[date(ARCHIVED_YEAR, 3, 2)]
+
+    record, is_update = _mark(db, "EMP001", date(ARCHIVED_YEAR, 3, 2), "Absent")
+    assert is_update
+    assert record.id == before.id
+    assert db.query(AttendanceArchive).one().record_count == 4
+
+    after = {r.date: r for r in crud.list_attendance(db)}[date(ARCHIVED_YEAR, 3, 2)]
+    assert after.status.value == "Absent"
+    assert after.id == before.id
+
+
+def test_delete_employee_removes_archived_rows(split_store):
+    db = split_store
+    crud.delete_employee(db, "EMP001")
+    assert db.query(AttendanceArchive).count() == 0
+    assert crud.list_attendance(db) == []
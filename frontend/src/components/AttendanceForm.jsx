@@ -1,10 +1,13 @@
-import { useState, useEffect } from "react";
-import { employeeAPI } from "../services/api";
+import { useState } from "react";
 import { Check, AlertTriangle, User, Calendar, BarChart2, CheckCircle, XCircle, ArrowRight } from 'lucide-react';
 
-export default function AttendanceForm({ onSubmit, isLoading = false }) {
-  const [employees, setEmployees] = useState([]);
-  const [employeesLoading, setEmployeesLoading] = useState(true);
+export default function AttendanceForm({
+  onSubmit,
+  isLoading = false,
+  employees = [],
+  employeesLoading = false,
+  todayAttendance = {},
+}) {
   const [formData, setFormData] = useState({
     employee_id: "",
     date: new Date().toISOString().split("T")[0],
@@ -12,21 +15,11 @@ export default function AttendanceForm({ onSubmit, isLoading = false }) {
   });
   const [error, setError] = useState("");
 
-  useEffect(() => {
-    fetchEmployees();
-  }, []);
-
-  const fetchEmployees = async () => {
-    try {
-      const response = await employeeAPI.list();
-      setEmployees(response.data);
-    } catch (err) {
-      console.error("Failed to fetch employees:", err);
-      setError("Failed to load employees");
-    } finally {
-      setEmployeesLoading(false);
-    }
-  };
+  const today = new Date().toISOString().split("T")[0];
+  const markedToday =
+    formData.employee_id && formData.date === today
+      ? todayAttendance[formData.employee_id]
+      : null;
 
   const handleChange = (e) => {
     const { name, value } = e.target;
@@ -145,6 +138,12 @@ export default function AttendanceForm({ onSubmit, isLoading = false }) {
         </div>
       </div>
 
+      {markedToday && (
+        <p className="mt-4 text-sm text-gray-600">
+          Already marked <span className="font-semibold">{markedToday}</span> today. Submitting will update it.
+        </p>
+      )}
+
       <button
         type="submit"
         disabled={isLoading || employeesLoading}
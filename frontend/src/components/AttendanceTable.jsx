@@ -6,6 +6,7 @@ export default function AttendanceTable({
   currentPage = 1,
   onPageChange = () => {},
   recordsPerPage = 10,
+  employeeNames = {},
 }) {
   // Calculate pagination
   const totalPages = Math.ceil(records.length / recordsPerPage);
@@ -109,6 +110,9 @@ export default function AttendanceTable({
                 >
                   <td className="px-6 py-4 whitespace-nowrap text-sm font-semibold text-gray-900">
                     {record.employee_id}
+                    {employeeNames[record.employee_id] && (
+                      <div className="text-xs font-normal text-gray-500">{employeeNames[record.employee_id]}</div>
+                    )}
                   </td>
                   <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-700">
                     {new Date(record.date).toLocaleDateString()}
@@ -3,6 +3,7 @@ import { API_BASE_URL } from "../services/api";
 
 export default function EmployeeTable({
   employees,
+  todayAttendance = {},
   isLoading = false,
   onDelete,
 }) {
@@ -56,6 +57,7 @@ export default function EmployeeTable({
               <th className="px-6 py-4 text-left text-xs font-semibold text-gray-700 uppercase tracking-wide">Name</th>
               <th className="px-6 py-4 text-left text-xs font-semibold text-gray-700 uppercase tracking-wide">Email</th>
               <th className="px-6 py-4 text-left text-xs font-semibold text-gray-700 uppercase tracking-wide">Department</th>
+              <th className="px-6 py-4 text-left text-xs font-semibold text-gray-700 uppercase tracking-wide">Today</th>
               <th className="px-6 py-4 text-center text-xs font-semibold text-gray-700 uppercase tracking-wide">Action</th>
             </tr>
           </thead>
@@ -92,6 +94,21 @@ export default function EmployeeTable({
                     {employee.department}
                   </span>
                 </td>
+                <td className="px-6 py-4 whitespace-nowrap text-sm">
+                  {todayAttendance[employee.employee_id] ? (
+                    <span
+                      className={`px-2.5 py-1 rounded-lg font-medium text-xs ${
+                        todayAttendance[employee.employee_id] === "Present"
+                          ? "bg-green-100 text-green-700"
+                          : "bg-red-100 text-red-700"
+                      }`}
+                    >
+                      {todayAttendance[employee.employee_id]}
+                    </span>
+                  ) : (
+                    <span className="text-xs text-gray-400">Not marked</span>
+                  )}
+                </td>
                 <td className="px-6 py-4 whitespace-nowrap text-center">
                   <button
                     onClick={() => {
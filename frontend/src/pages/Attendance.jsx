@@ -1,19 +1,42 @@
-import { useState, useEffect, useCallback } from "react";
+import { useState, useEffect, useCallback, useMemo } from "react";
 import AttendanceForm from "../components/AttendanceForm";
 import AttendanceTable from "../components/AttendanceTable";
-import { attendanceAPI } from "../services/api";
+import { attendanceAPI, dashboardAPI } from "../services/api";
 import { Clipboard, CheckCircle, AlertTriangle } from 'lucide-react';
 
 const RECORDS_PER_PAGE = 10;
 
 export default function Attendance() {
   const [records, setRecords] = useState([]);
+  const [employees, setEmployees] = useState([]);
+  const [employeesLoading, setEmployeesLoading] = useState(true);
+  const [todayAttendance, setTodayAttendance] = useState({});
+  const [recordNames, setRecordNames] = useState({});
   const [isLoading, setIsLoading] = useState(false);
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [successMessage, setSuccessMessage] = useState("");
   const [errorMessage, setErrorMessage] = useState("");
   const [currentPage, setCurrentPage] = useState(1);
 
+  // Records, the form's employees, today's statuses and record names in one request
+  const fetchPage = useCallback(async () => {
+    setIsLoading(true);
+    try {
+      const response = await dashboardAPI.bootstrap({ includeAttendance: true });
+      setRecords(response.data.attendance || []);
+      setEmployees(response.data.employees || []);
+      setTodayAttendance(response.data.today_attendance || {});
+      setRecordNames(response.data.employee_names || {});
+      setErrorMessage("");
+    } catch (error) {
+      console.error("Error fetching attendance:", error);
+      setErrorMessage("Failed to load attendance records. Please try again.");
+    } finally {
+      setIsLoading(false);
+      setEmployeesLoading(false);
+    }
+  }, []);
+
   const fetchAttendance = useCallback(async () => {
     setIsLoading(true);
     try {
@@ -29,8 +52,16 @@ export default function Attendance() {
   }, []);
 
   useEffect(() => {
-    fetchAttendance();
-  }, [fetchAttendance]);
+    fetchPage();
+  }, [fetchPage]);
+
+  const employeeNames = useMemo(() => {
+    const names = { ...recordNames };
+    employees.forEach((emp) => {
+      names[emp.employee_id] = emp.full_name;
+    });
+    return names;
+  }, [employees, recordNames]);
 
   const handleMarkAttendance = async (formData) => {
     setIsSubmitting(true);
@@ -38,8 +69,15 @@ export default function Attendance() {
     setSuccessMessage("");
 
     try {
-      await attendanceAPI.mark(formData);
+      const response = await attendanceAPI.mark(formData);
       setSuccessMessage("Attendance marked successfully!");
+      // Today's statuses come from the mark response; only the records are refetched
+      if (response.data.date === new Date().toISOString().split("T")[0]) {
+        setTodayAttendance((prev) => ({
+          ...prev,
+          [response.data.employee_id]: response.data.status,
+        }));
+      }
       await fetchAttendance();
       setCurrentPage(1); // Reset to first page after adding new record
       setTimeout(() => setSuccessMessage(""), 3000);
@@ -79,7 +117,13 @@ export default function Attendance() {
         </div>
       )}
 
-      <AttendanceForm onSubmit={handleMarkAttendance} isLoading={isSubmitting} />
+      <AttendanceForm
+        onSubmit={handleMarkAttendance}
+        isLoading={isSubmitting}
+        employees={employees}
+        employeesLoading={employeesLoading}
+        todayAttendance={todayAttendance}
+      />
 
       <AttendanceTable 
         records={records} 
@@ -87,6 +131,7 @@ export default function Attendance() {
         currentPage={currentPage}
         onPageChange={setCurrentPage}
         recordsPerPage={RECORDS_PER_PAGE}
+        employeeNames={employeeNames}
       />
     </div>
   );
@@ -1,11 +1,12 @@
 import { useState, useEffect, useCallback } from "react";
 import EmployeeForm from "../components/EmployeeForm";
 import EmployeeTable from "../components/EmployeeTable";
-import { employeeAPI } from "../services/api";
+import { employeeAPI, dashboardAPI } from "../services/api";
 import { Users, CheckCircle, AlertTriangle } from 'lucide-react';
 
 export default function Employees() {
   const [employees, setEmployees] = useState([]);
+  const [todayAttendance, setTodayAttendance] = useState({});
   const [isLoading, setIsLoading] = useState(false);
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [successMessage, setSuccessMessage] = useState("");
@@ -32,11 +33,13 @@ export default function Employees() {
     setIsLoading(true);
     try {
       console.log('Fetching employees...');
-      const response = await employeeAPI.list();
+      // One request for the list and today's status of every employee
+      const response = await dashboardAPI.bootstrap();
       console.log('Employees API response:', response);
       
       if (response && response.data) {
-        setEmployees(response.data);
+        setEmployees(response.data.employees || []);
+        setTodayAttendance(response.data.today_attendance || {});
         setErrorMessage("");
       } else {
         console.warn('Invalid response format:', response);
@@ -140,6 +143,7 @@ export default function Employees() {
 
       <EmployeeTable
         employees={employees}
+        todayAttendance={todayAttendance}
         isLoading={isLoading}
         onDelete={handleDeleteEmployee}
       />
@@ -28,6 +28,9 @@ const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
 const getCacheKey = (url, params) => `${url}?${JSON.stringify(params || {})}`;
 const isCacheValid = (timestamp) => Date.now() - timestamp < CACHE_DURATION;
 
+// Requests shed by the server (429/503) are retried after Retry-After
+const MAX_SHED_RETRIES = 2;
+
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {},
@@ -94,6 +97,20 @@ api.interceptors.response.use(
     return response;
   },
   (error) => {
+    // The server rejected the request before running it (rate limited or
+    // overloaded), so it is safe to retry once the server says to
+    const config = error.config;
+    const statusCode = error.response?.status;
+    if (config && (statusCode === 429 || statusCode === 503)) {
+      config.shedRetries = (config.shedRetries || 0) + 1;
+      if (config.shedRetries <= MAX_SHED_RETRIES) {
+        const retryAfter = Number(error.response.headers?.["retry-after"]) || 1;
+        // Jitter so clients shed together don't retry together
+        const delay = retryAfter * 1000 * (1 + Math.random() * 0.5);
+        return new Promise((resolve) => setTimeout(resolve, delay)).then(() => api(config));
+      }
+    }
+
     if (error.response) {
       // Server responded with error status
       console.error("API Error:", error.response.data);
@@ -145,6 +162,19 @@ export const attendanceAPI = {
 // Dashboard APIs
 export const dashboardAPI = {
   getStats: () => api.get("/api/dashboard/stats"),
+  // Stats, an employee page and today's attendance map in one request; with
+  // includeAttendance also the latest records and their employees' names.
+  // Seeds the stats cache so Home/Dashboard don't refetch afterwards.
+  bootstrap: ({ skip = 0, limit = 100, includeAttendance = false } = {}) =>
+    api.get("/api/dashboard/bootstrap", {
+      params: { skip, limit, include_attendance: includeAttendance },
+    }).then((response) => {
+      cache.set(getCacheKey("/api/dashboard/stats"), {
+        data: response.data.stats,
+        timestamp: Date.now(),
+      });
+      return response;
+    }),
 };
 
 // Health Check API